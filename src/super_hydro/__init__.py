@@ -1,3 +1,12 @@
-from importlib import metadata
+def __getattr__(name):
+    """Compute `__version__` on first access (PEP 562).
 
-__version__ = metadata.version(__name__)
+    Importing :mod:`importlib.metadata` and looking up the distribution is a large part
+    of the import time for the CLI, which does not need it.
+    """
+    if name == "__version__":
+        from importlib import metadata
+
+        globals()["__version__"] = version = metadata.version(__name__)
+        return version
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
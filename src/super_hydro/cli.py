@@ -74,19 +74,22 @@ the `result_callback` is used to actually execute the program.
 .. _Click: https://click.palletsprojects.com/en/8.1.x/documentation/
 
 """
-from typing import List, Optional
+from typing import List, Optional, Union, TYPE_CHECKING
 from dataclasses import dataclass, field
-from functools import partial
-import configparser
-import importlib
-import pkgutil
+from functools import lru_cache, partial
 import os.path
+import stat
+import sys
 
 import click
 
-from .interfaces import IModel
+# Other imports (configparser, importlib, zope.interface, etc.) are deferred to the
+# callbacks that need them to keep `super_hydro --help` responsive.
 from . import physics
 
+if TYPE_CHECKING:
+    import configparser
+
 APP_NAME = "super_hydro"
 
 
@@ -95,33 +98,164 @@ def process_path(path):
     return os.path.normpath(os.path.expandvars(os.path.expanduser(path)))
 
 
-# Standard XDG config directory
-# https://specifications.freedesktop.org/basedir-spec/basedir-spec-0.6.html
-XDG_CONFIG_HOME = process_path(os.environ.get("XDG_CONFIG_HOME", "~/.config"))
+CONFIG_FILE_NAME = "super_hydro.conf"
 
-# This directory
-SUPER_HYDRO_DIR = process_path(os.path.join(os.path.dirname(__file__), ".."))
 
-SUPER_HYDRO_APP_DIR = click.get_app_dir("super_hydro")
+@lru_cache(maxsize=None)
+def get_default_config_files():
+    """Return the default config files, in order of increasing precedence.
 
-CONFIG_FILE_NAME = "super_hydro.conf"
+    These are only computed when the config files are processed, not on import.
+    """
+    # Standard XDG config directory
+    # https://specifications.freedesktop.org/basedir-spec/basedir-spec-0.6.html
+    xdg_config_home = os.environ.get("XDG_CONFIG_HOME", "~/.config")
+
+    # This directory
+    super_hydro_dir = os.path.join(os.path.dirname(__file__), "..")
+
+    return tuple(
+        process_path(os.path.join(_dir, CONFIG_FILE_NAME))
+        for _dir in [
+            super_hydro_dir,
+            click.get_app_dir(APP_NAME),
+            "/etc",
+            xdg_config_home,
+            "~",
+            ".",
+        ]
+    )
 
-DEFAULT_CONFIG_FILES = [
-    process_path(os.path.join(_dir, CONFIG_FILE_NAME))
-    for _dir in [
-        SUPER_HYDRO_DIR,
-        SUPER_HYDRO_APP_DIR,
-        "/etc",
-        XDG_CONFIG_HOME,
-        "~",
-        ".",
-    ]
-]
+
+def __getattr__(name):
+    """Provide `DEFAULT_CONFIG_FILES` on first access (PEP 562)."""
+    if name == "DEFAULT_CONFIG_FILES":
+        return list(get_default_config_files())
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 __all__ = ["ModelGroup"]
 
 
+@lru_cache(maxsize=None)
+def get_params_and_docs(Model):
+    """Return `Model.get_params_and_docs()` as a tuple.
+
+    This is needed both to build the model commands and to collect the options, so we
+    only compute it once per model.
+    """
+    return tuple(Model.get_params_and_docs())
+
+
+def parse_config_value(value, default):
+    """Return the config-file string `value` converted to the type of `default`.
+
+    Scalars are converted directly with their type (booleans as by
+    :meth:`configparser.ConfigParser.getboolean`), while other values such as tuples are
+    parsed with :func:`ast.literal_eval`.  Integers may also be given as integral
+    floats like ``3.0`` or ``1e3``.
+    """
+    if isinstance(default, bool):
+        states = {"1": True, "yes": True, "true": True, "on": True}
+        states.update({"0": False, "no": False, "false": False, "off": False})
+        if value.lower() not in states:
+            raise ValueError(f"Not a boolean: {value!r}")
+        return states[value.lower()]
+    if isinstance(default, int):
+        try:
+            return int(value)
+        except ValueError:
+            _value = float(value)
+            if not _value.is_integer():
+                raise ValueError(f"Not an integer: {value!r}") from None
+            return int(_value)
+    if isinstance(default, (float, str)):
+        return type(default)(value)
+
+    import ast
+
+    return ast.literal_eval(value)
+
+
+def parse_models(value):
+    """Return the list of model modules from the config-file string `value`.
+
+    The modules may be given as a list or tuple literal, as a single quoted string, or
+    as names separated by commas and/or whitespace.
+    """
+    import ast
+    import re
+
+    try:
+        models = ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        return [_name for _name in re.split(r"[,\s]+", value.strip()) if _name]
+    if isinstance(models, str):
+        models = [models]
+    if not isinstance(models, (list, tuple)) or not all(
+        isinstance(_name, str) for _name in models
+    ):
+        raise ValueError(f"Invalid models={value!r}: expected a list of module names")
+    return list(models)
+
+
+@lru_cache(maxsize=1)
+def read_config_files(signature):
+    """Return `(parser, files, options)` for the config files in `signature`.
+
+    The `signature` is a tuple of `(path, mtime_ns, size)` for each file so that the
+    files are read again if they change.  Only the latest result is cached.
+    """
+    import configparser
+
+    # To Do: Maybe load one file at a time and do some error parsing?
+    # Values are converted by parse_config_value(), so no interpolation: this also
+    # allows values to contain "%".
+    parser = configparser.RawConfigParser()
+    parser.optionxform = str  # Prevent conversion to lowercase
+    files = parser.read([_path for (_path, _mtime, _size) in signature])
+    options = {section: dict(parser.items(section, raw=True)) for section in parser}
+    return parser, files, options
+
+
+# Models in super_hydro.physics are referred to without this prefix.
+_PHYSICS_PREFIX = physics.__name__ + "."
+
+
+def get_model_prefix(module_name):
+    """Return the prefix of the CLI names for models in module `module_name`."""
+    if module_name.startswith(_PHYSICS_PREFIX):
+        module_name = module_name[len(_PHYSICS_PREFIX) :]
+    return module_name + "."
+
+
+@dataclass(frozen=True)
+class ModelRef:
+    """Reference to a model class that is only imported when needed.
+
+    This allows the models to be listed (with `doc` as the help) without importing
+    the modules (and all of their dependencies like NumPy).
+    """
+
+    module: str
+    name: str
+    doc: Optional[str] = None
+
+    @lru_cache(maxsize=None)
+    def load(self):
+        """Import and return the model class (cached)."""
+        import importlib
+
+        from .interfaces import IModel
+
+        Model = getattr(importlib.import_module(self.module), self.name, None)
+        if not (isinstance(Model, type) and IModel.implementedBy(Model)):
+            raise click.ClickException(
+                f"{self.module}.{self.name} is not a model implementing IModel"
+            )
+        return Model
+
+
 class ModelGroup(click.Group):
     """Custom group allowing allowing each model to have different arguments.
 
@@ -144,9 +278,6 @@ class ModelGroup(click.Group):
 
     # https://stackoverflow.com/a/58770064/1088938
 
-    config_files = ()
-    verbosity = 0
-
     ######################################################################
     # Customizations of methods
     def list_commands(self, ctx):
@@ -156,15 +287,16 @@ class ModelGroup(click.Group):
     def format_commands(self, ctx, formatter):
         # Modified fom the base class method
 
+        params = ctx.ensure_object(SuperHydroParams)
         commands = []
-        models = []
-        for subcommand in self.list_commands(ctx):
+        for subcommand in super().list_commands(ctx):
             cmd = self.get_command(ctx, subcommand)
-            if subcommand in ctx.obj.models:
-                models.append((subcommand, cmd))
-            elif not (cmd is None or cmd.hidden):
+            if not (cmd is None or cmd.hidden):
                 commands.append((subcommand, cmd))
 
+        # Don't build (and import) the model commands just to list them.
+        models = [(_name, params.get_model_doc(_name)) for _name in params.models]
+
         if commands:
             longest = max(len(cmd[0]) for cmd in commands)
             # allow for 3 times the default spacing
@@ -174,7 +306,7 @@ class ModelGroup(click.Group):
                 rows = []
                 for subcommand, cmd in commands:
                     help_str = cmd.get_short_help_str(limit)
-                    subcommand += " " * (longest - len(subcommand))
+                    subcommand = subcommand.ljust(longest)
                     rows.append((subcommand, help_str))
                 formatter.write_dl(rows)
 
@@ -185,15 +317,16 @@ class ModelGroup(click.Group):
 
             with formatter.section("Available Models"):
                 rows = []
-                for model_name, cmd in models:
-                    help_str = cmd.get_short_help_str(limit)
-                    model_name += " " * (longest - len(model_name))
+                for model_name, doc in models:
+                    help_str = click.utils.make_default_short_help(doc or "", limit)
+                    model_name = model_name.ljust(longest)
                     rows.append((model_name, help_str))
                 formatter.write_dl(rows)
 
-        if self.verbosity > 2:
+        if models and params.verbosity > 2:
             with formatter.section("Models Parameters"):
-                for model_name, cmd in models:
+                for model_name, doc in models:
+                    cmd = self.get_command(ctx, model_name)
                     formatter.write("\n")
                     formatter.write(model_name)
                     cmd.format_help_text(ctx, formatter)
@@ -209,28 +342,52 @@ class ModelGroup(click.Group):
     ######################################################################
     # Helper methods not part of click.
     @staticmethod
-    def _callback(*, _model_name, _ctx, **kwargs):
-        """Callback that stores the parameters."""
-        ctx = _ctx.find_root()
-        params = ctx.ensure_object(SuperHydroParams)
+    def _callback(*, _model_name, **kwargs):
+        """Callback that stores the parameters.
+
+        Only the values given on the command line are stored (already converted by
+        click) so that the defaults do not override values from the config files.
+        """
+        model_ctx = click.get_current_context()
+        params = model_ctx.find_root().ensure_object(SuperHydroParams)
+        kwargs = {
+            _key: _value
+            for _key, _value in kwargs.items()
+            if model_ctx.get_parameter_source(_key)
+            is not click.core.ParameterSource.DEFAULT
+        }
         if params.test_cli:
             click.echo(f"{_model_name=} invoked with {kwargs=}")
         params.model_options[_model_name] = kwargs
 
     @classmethod
     def _get_model_command(cls, ctx, name):
-        """Return a class`click.Command` instance for the model."""
+        """Return a class`click.Command` instance for the model.
+
+        The commands are cached in `ctx.obj` since `format_commands` and
+        `invoke_models` request them for every model.  The key includes the model
+        class in case a later module (e.g. from a config file) redefines `name`.
+        """
         params = ctx.ensure_object(SuperHydroParams)
-        Model = params.models[name]
+        Model = params.get_model(name)
+        key = (name, Model, params.verbosity)
+        if key not in params.model_commands:
+            params.model_commands[key] = cls._make_model_command(
+                name, Model, verbosity=params.verbosity
+            )
+        return params.model_commands[key]
+
+    @classmethod
+    def _make_model_command(cls, name, Model, verbosity=0):
         params = [
             click.Option(
                 param_decls=[f"--{_name}", f"{_name}"],
-                show_default=cls.verbosity > 0,
+                show_default=verbosity > 0,
                 type=type(_value),
                 default=_value,
                 help=_doc,
             )
-            for _name, _value, _doc in Model.get_params_and_docs()
+            for _name, _value, _doc in get_params_and_docs(Model)
         ]
         command = click.Command(
             name=name,
@@ -238,7 +395,7 @@ class ModelGroup(click.Group):
             help=Model.__doc__,
             add_help_option=True,
             no_args_is_help=True,
-            callback=partial(cls._callback, _model_name=name, _ctx=ctx),
+            callback=partial(cls._callback, _model_name=name),
         )
         return command
 
@@ -265,15 +422,33 @@ class ModelGroup(click.Group):
         return wrapper
 
 
-@dataclass
+# Use __slots__ where supported (Python 3.10+) to avoid the per-instance __dict__.
+@dataclass(**(dict(slots=True) if sys.version_info >= (3, 10) else {}))
 class SuperHydroParams:
     """Object used in `ctx.obj` for storing information about the application."""
 
-    models: dict[str, str] = field(default_factory=dict)
+    models: dict[str, Union[type, ModelRef]] = field(default_factory=dict)
+    model_modules: set[str] = field(default_factory=set)  # Modules searched for models
     config_files: List[str] = field(default_factory=list)
     model_options: dict[str, dict] = field(default_factory=dict)
     test_cli: bool = False
     verbosity: int = 0
+    config_parser: Optional["configparser.RawConfigParser"] = field(
+        default=None, repr=False
+    )
+    model_commands: dict[tuple, click.Command] = field(default_factory=dict, repr=False)
+
+    def get_model(self, name):
+        """Return the model class `name`, importing it if needed."""
+        Model = self.models[name]
+        if isinstance(Model, ModelRef):
+            Model = self.models[name] = Model.load()
+        return Model
+
+    def get_model_doc(self, name):
+        """Return the docstring of model `name` without importing it."""
+        Model = self.models[name]
+        return Model.doc if isinstance(Model, ModelRef) else Model.__doc__
 
     def get_options(self, ctx):
         """Return the dictionary of options for the models.
@@ -283,8 +458,8 @@ class SuperHydroParams:
         """
         config_options = self.load_config_files()
 
-        # Gets any models from the config files and add them
-        models = config_options.get("super_hydro", {}).get("models", [])
+        # Gets any models from the config files and add them.
+        models = parse_models(config_options.get("super_hydro", {}).get("models", ""))
         if models:
             set_model_modules(ctx, param=None, value=models)
 
@@ -293,31 +468,56 @@ class SuperHydroParams:
         # Process each model
 
         for model in self.models:
-            Model = self.models[model]
+            Model = self.get_model(model)
             config_opts = config_options.get(model, {})
-            options[model] = {
-                _param: self.model_options.get(model, {}).get(
-                    _param, config_opts.pop(_param, defaults.get(_param, _value))
-                )
-                for _param, _value, _doc in Model.get_params_and_docs()
-            }
+            model_opts = self.model_options.get(model, {})
+            options[model] = {}
+            for _param, _value, _doc in get_params_and_docs(Model):
+                # Always pop so that unknown parameters can be detected below.
+                value = config_opts.pop(_param, defaults.get(_param))
+                if _param in model_opts:
+                    value = model_opts[_param]  # Already converted by click
+                elif value is None:
+                    value = _value
+                else:
+                    try:
+                        value = parse_config_value(value, default=_value)
+                    except (ValueError, SyntaxError) as err:
+                        raise ValueError(
+                            f"Invalid value {value!r} for parameter {_param!r} "
+                            f"of {model=}: {err}"
+                        ) from err
+                options[model][_param] = value
             if config_opts:
                 raise ValueError(f"Unknown parameters {config_opts} for {model=}")
 
         return options
 
     def load_config_files(self):
-        """Return options from the config files."""
-        # To Do: Maybe load one file at a time and do some error parsing?
-        parser = configparser.ConfigParser()
-        parser.optionxform = str  # Prevent conversion to lowercase
-        files = parser.read(self.config_files)
+        """Return options from the config files.
+
+        The parsed files are cached by :func:`read_config_files` until one of them is
+        added, removed, or modified.
+        """
+        # Most of the default locations do not exist, so skip them before reading.  The
+        # same file can also appear more than once (e.g. "~" and "." when running from
+        # the home directory): only read the last occurrence, which takes precedence.
+        files = {}
+        for path in self.config_files:
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            if stat.S_ISREG(st.st_mode):
+                files.pop((st.st_dev, st.st_ino), None)
+                files[(st.st_dev, st.st_ino)] = (path, st.st_mtime_ns, st.st_size)
+        parser, files, options = read_config_files(tuple(files.values()))
         if self.verbosity > 1 and files:
             click.echo(f"Configuration loaded from {files}")
         self.config_parser = parser
 
-        options = {section: dict(parser[section]) for section in parser}
-        return options
+        # Copy since the caller consumes these.
+        return {section: dict(options[section]) for section in options}
 
     def invoke_models(self, ctx):
         """Call `_callback()` for models so that the parameters are set."""
@@ -344,23 +544,35 @@ class SuperHydroParams:
         2. Does not start with an underscore.
         3. Is specified in ``mod.__all__`` if the module has ``__all__``.
         """
-        models = [
-            (f"{mod.__name__}.{name}", getattr(mod, name))
-            for name in getattr(mod, "__all__", mod.__dict__.keys())
-            if not name.startswith("_") and hasattr(mod, name)
-        ]
-
-        models = [
-            (  # Only include full model name if they are not in physics
-                name[len(physics.__name__) + 1 :]
-                if name.startswith(physics.__name__)
-                else name,
-                Model,
-            )
-            for (name, Model) in models
+        from .interfaces import IModel
+
+        prefix = get_model_prefix(mod.__name__)
+        return {
+            f"{prefix}{name}": Model
+            for name in getattr(mod, "__all__", mod.__dict__)
+            if not name.startswith("_")
+            for Model in [getattr(mod, name, None)]
             if isinstance(Model, type) and IModel.implementedBy(Model)
-        ]
-        return dict(models)
+        }
+
+    @staticmethod
+    def find_models(module_name):
+        """Return `{name: Model}` for the models in the module `module_name`.
+
+        The modules in :mod:`super_hydro.physics` are parsed rather than imported, and
+        the models are returned as :class:`ModelRef` instances (see
+        :func:`_parse_models`).  Other modules, and physics modules whose source cannot
+        be analyzed with certainty, are imported and :meth:`get_models` is used.
+        Raises :exc:`ImportError` if the module cannot be found.
+        """
+        if module_name.startswith(_PHYSICS_PREFIX):
+            models = _find_physics_models(module_name)
+            if models is not None:
+                return models
+
+        import importlib
+
+        return SuperHydroParams.get_models(importlib.import_module(module_name))
 
     ######################################################################
     # Functions for debugging and testing.
@@ -377,6 +589,210 @@ class SuperHydroParams:
             model = self.super_hydro_group.get_command(ctx, model_name)
 
 
+def _find_physics_models(module_name):
+    """Return `{name: ModelRef}` for the physics module `module_name` or `None`.
+
+    Helper for :meth:`SuperHydroParams.find_models`.  Returns `None` if the module
+    must be imported instead.
+    """
+    classes = _scan_physics_module(module_name)
+    if classes is None:
+        return None
+    prefix = get_model_prefix(module_name)
+    return {
+        f"{prefix}{name}": ModelRef(module=module_name, name=name, doc=doc)
+        for name, (is_model, doc) in classes.items()
+        if is_model
+    }
+
+
+def _scan_physics_module(module_name):
+    """Return the result of :func:`_parse_models` for `module_name` or `None`."""
+    import importlib.util
+
+    spec = importlib.util.find_spec(module_name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named {module_name!r}")
+    if not (spec.origin or "").endswith(".py"):
+        return None
+    try:
+        mtime_ns = os.stat(spec.origin).st_mtime_ns
+    except OSError:
+        return None
+    return _parse_models(module_name, spec.origin, mtime_ns)
+
+
+@lru_cache(maxsize=None)
+def _parse_models(module_name, origin, mtime_ns):
+    """Return `{name: (is_model, doc)}` for the exported classes of a physics module.
+
+    The source file `origin` of the module `module_name` in :mod:`super_hydro.physics`
+    is parsed without importing it (see :class:`_ModelScanner`).  As in
+    :meth:`SuperHydroParams.get_models`, only names listed in ``__all__`` (if present)
+    and not starting with an underscore are exported.  The results are cached, with
+    `mtime_ns` ensuring that modified files are parsed again.
+
+    Returns `None` whenever this analysis might differ from importing the module.
+    """
+    import ast
+
+    try:
+        with open(origin, "rb") as f:
+            tree = ast.parse(f.read(), filename=origin)
+    except (OSError, SyntaxError):
+        return None
+
+    scanner = _ModelScanner(module_name)
+    try:
+        for node in tree.body:
+            scanner.visit(node)
+        return scanner.get_exported()
+    except _ModelScanner.Uncertain:
+        return None
+
+
+class _ModelScanner:
+    """Find the classes bound at the top level of a physics module from its AST.
+
+    Models are classes decorated with ``@implementer(IModel)``, or derived from a
+    model, where the bases must be defined in the module or imported from another
+    physics module.  Visiting a node raises :exc:`Uncertain` whenever the analysis
+    might differ from importing the module: e.g. if a base class is not known, a class
+    or import is defined conditionally (in an ``if`` or ``try`` block), or ``__all__``
+    is not a literal or is modified.
+    """
+
+    class Uncertain(Exception):
+        """The module must be imported to find the models."""
+
+    def __init__(self, module_name):
+        self.package = module_name.rpartition(".")[0]
+        self.classes = {}  # {name: (is_model, doc)} for the classes in the module.
+        self.bound = set()  # All other names bound in the module.
+        self.names = None  # Contents of __all__
+
+    def visit(self, node):
+        import ast
+
+        if isinstance(node, ast.ClassDef):
+            self.visit_ClassDef(node)
+        elif isinstance(node, ast.ImportFrom):
+            self.visit_ImportFrom(node)
+        elif isinstance(node, ast.Import):
+            self.bind([(_a.asname or _a.name).split(".")[0] for _a in node.names])
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            self.bind([node.name])
+        elif isinstance(node, (ast.Assign, ast.AnnAssign, ast.AugAssign)):
+            self.visit_assignment(node)
+        else:
+            self.visit_other(node)
+
+    def bind(self, names):
+        """Record that `names` are bound to something other than a class."""
+        for name in names:
+            self.classes.pop(name, None)
+        self.bound.update(names)
+
+    def visit_ClassDef(self, node):
+        import ast
+
+        is_model = any(map(self.is_implementer, node.decorator_list))
+        for base in node.bases:
+            if isinstance(base, ast.Name) and base.id == "object":
+                continue
+            if not (isinstance(base, ast.Name) and base.id in self.classes):
+                raise self.Uncertain(f"Unknown base {ast.unparse(base)}")
+            is_model = is_model or self.classes[base.id][0]
+        self.classes[node.name] = (is_model, ast.get_docstring(node))
+
+    def visit_ImportFrom(self, node):
+        import importlib.util
+
+        from_name = node.module
+        if node.level:
+            from_name = importlib.util.resolve_name(
+                "." * node.level + (node.module or ""), self.package
+            )
+        from_classes = {}
+        if from_name.startswith(_PHYSICS_PREFIX):
+            # Models can only be imported from other physics modules.
+            from_classes = _scan_physics_module(from_name)
+            if from_classes is None:
+                raise self.Uncertain(f"Cannot scan {from_name}")
+        for alias in node.names:
+            if alias.name == "*":
+                raise self.Uncertain(f"from {from_name} import *")
+            name = alias.asname or alias.name
+            self.bind([name])
+            if alias.name in from_classes:
+                self.classes[name] = from_classes[alias.name]
+
+    def visit_assignment(self, node):
+        import ast
+
+        targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+        names = [
+            _n.id for _t in targets for _n in ast.walk(_t) if isinstance(_n, ast.Name)
+        ]
+        if "__all__" in names:
+            if not isinstance(node, ast.Assign) or len(names) > 1:
+                raise self.Uncertain("__all__ is modified")
+            try:
+                self.names = list(ast.literal_eval(node.value))
+            except ValueError:
+                raise self.Uncertain("__all__ is not a literal")
+            return
+
+        value = node.value
+        self.bind(names)
+        if isinstance(value, ast.Name) and value.id in self.classes:
+            # Alias of a class
+            self.classes.update(dict.fromkeys(names, self.classes[value.id]))
+
+    def visit_other(self, node):
+        """Conditional definitions, or anything else that might modify `__all__`."""
+        import ast
+
+        for _n in ast.walk(node):
+            if isinstance(_n, (ast.ClassDef, ast.ImportFrom)):
+                raise self.Uncertain("Conditional class or import")
+            elif isinstance(_n, ast.Name) and _n.id == "__all__":
+                raise self.Uncertain("__all__ is modified")
+            elif isinstance(_n, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                self.bind([_n.name])
+            elif isinstance(_n, ast.Import):
+                self.bind([(_a.asname or _a.name).split(".")[0] for _a in _n.names])
+            elif isinstance(_n, ast.Name) and isinstance(_n.ctx, ast.Store):
+                self.bind([_n.id])
+
+    @staticmethod
+    def is_implementer(decorator):
+        """Return `True` if `decorator` is ``@implementer(IModel)``."""
+        import ast
+
+        return (
+            isinstance(decorator, ast.Call)
+            and ast.unparse(decorator.func).split(".")[-1] == "implementer"
+            and any(
+                ast.unparse(_arg).split(".")[-1] == "IModel"
+                for _arg in decorator.args
+            )
+        )
+
+    def get_exported(self):
+        """Return `{name: (is_model, doc)}` for the exported classes."""
+        names = self.names
+        if names is None:
+            names = list(self.classes)
+        elif not set(names).issubset(self.bound.union(self.classes)):
+            raise self.Uncertain("__all__ exports unknown names")
+        return {
+            name: self.classes[name]
+            for name in names
+            if name in self.classes and not name.startswith("_")
+        }
+
+
 ######################################################################
 # Callbacks
 def set_param(ctx, param, value):
@@ -391,32 +807,44 @@ def set_config_files(ctx, param, value):
     if value:
         config_files = value = list(map(process_path, value))
 
-    params.config_files = list(DEFAULT_CONFIG_FILES) + config_files
+    params.config_files = list(get_default_config_files()) + config_files
 
 
 def set_model_modules(ctx, param, value):
     """Store all potential models in `ctx.obj.models`."""
+    import itertools
+
     group = ctx.command
     params = ctx.ensure_object(SuperHydroParams)
     models = params.models
 
-    super_hydro_names = [
-        f"{physics.__name__}.{_m.name}" for _m in pkgutil.iter_modules(physics.__path__)
-    ]
-
     # Unique list of names with ours first.
-    names = dict.fromkeys(super_hydro_names + list(value))
+    names = dict.fromkeys(itertools.chain(get_physics_modules(), value))
 
     for name in names:
+        if name in params.model_modules:
+            # Already processed (this is also called from get_options()).
+            continue
         try:
-            mod = importlib.import_module(name)
-        except ImportError:
+            found = params.find_models(name)
+        except (ImportError, ValueError):
             click.echo(f"WARNING: Could not import requested `--models={name}`.")
             continue
-        models.update(params.get_models(mod))
+        models.update(found)
+        params.model_modules.add(name)
     params.models = models
 
 
+@lru_cache(maxsize=None)
+def get_physics_modules():
+    """Return the names of the modules in :mod:`super_hydro.physics`."""
+    import pkgutil
+
+    return [
+        f"{physics.__name__}.{_m.name}" for _m in pkgutil.iter_modules(physics.__path__)
+    ]
+
+
 ######################################################################
 # super_hydro
 #
@@ -453,7 +881,7 @@ def set_model_modules(ctx, param, value):
     "--client", is_flag=True,
     help="Start a local flask client")
 @click.option(
-    "--verbose", "-v", count=True, is_eager=True, expose_value=False,
+    "--verbose", "-v", "verbosity", count=True, is_eager=True, expose_value=False,
     help="Increase verbosity (-vvv to see all models)",
     callback=set_param)
 @click.option(
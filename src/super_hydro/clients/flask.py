@@ -8,11 +8,13 @@ For more details see :ref:`flask-client`.
 
 # Standard Library Imports
 from collections import OrderedDict
+from dataclasses import dataclass
 import importlib
 import inspect
 import logging
 import sys
 import time
+from typing import Any, Optional
 
 import numpy as np
 
@@ -104,6 +106,15 @@ class ServerProxy:
         self._running = False
 
 
+@dataclass
+class RunningModel:
+    """Information about a running model.  See :attr:`FlaskClient.running_models`."""
+
+    server: Optional[ServerProxy] = None
+    users: int = 0
+    d_thread: Any = None  # Thread running PushThread.run()
+
+
 def route(*v, **kw):
     """Use in class methods where @app.route would be used.
 
@@ -137,14 +148,16 @@ class FlaskClient(ClientDensityMixin):
     running_models : dict
         Dictionary of information about the running models.  Note: this is a class
         attribute - all instances use the same dictionary.  The key is the model name,
-        and the values are a dict with the following keys:
+        and the values are :class:`RunningModel` instances with the following
+        attributes:
 
-        'server' : ServerProxy
+        server : ServerProxy
             :class:`ServerProxy` object representing the computation server.
-        'users' : int
+        users : int
             Number of connected users.  In this context, a user is a different
-            window/tab or browser.
-        'd_thread' : Thread
+            window/tab or browser.  This is the size of the model's room, updated
+            whenever a user joins or leaves.
+        d_thread : Thread
             Thread object returned by
             :func:`flask_socketio.SocketIO.start_background_task` that is running the
             computational server.
@@ -181,7 +194,9 @@ class FlaskClient(ClientDensityMixin):
         self.models = self.get_models()
         self.demonstration = ModelNamespace(flask_client=self, root="/modelpage")
 
-        self.socketio = flask_socketio.SocketIO(self.app, async_handlers=False)
+        self.socketio = flask_socketio.SocketIO(
+            self.app, async_handlers=False, async_mode=self.opts.async_mode
+        )
         self.socketio.on_namespace(self.demonstration)
 
         print(f"Running Flask client on http://{self.opts.host}:{self.opts.port}")
@@ -250,8 +265,8 @@ class FlaskClient(ClientDensityMixin):
         for model_name in list(self.running_models):
             # Should we not pop?
             model = self.running_models[model_name]
-            if model["server"] is not None:
-                model["server"].quit()
+            if model.server is not None:
+                model.server.quit()
         self.shutdown_server()
         return flask.render_template("goodbye.html")
 
@@ -270,19 +285,8 @@ class FlaskClient(ClientDensityMixin):
             modpath = "super_hydro.physics.gpe"
             module = importlib.import_module(modpath)
 
-        clsmembers = inspect.getmembers(module, inspect.isclass)
-        # _modname = modpath.split(".")[-1]
-
-        model_names = []
-        models = []
-        for _x in range(len(clsmembers)):
-            model_name = clsmembers[_x][0]
-            model_class = model_name.split(".")[-1]
-            Model = getattr(module, model_class)
-
-            model_names.append(model_name)
-            models.append(Model)
-        return OrderedDict(zip(model_names, models))
+        # getmembers() already returns the (name, class) pairs sorted by name.
+        return OrderedDict(inspect.getmembers(module, inspect.isclass))
 
 
 #############################################################################
@@ -342,9 +346,9 @@ class ModelNamespace(flask_socketio.Namespace):
         running_models = self.flask_client.running_models
         if (
             model_name not in running_models
-            or running_models[model_name]["server"] is None
+            or running_models[model_name].server is None
         ):
-            model = dict(server=None, users=0, d_thread=None)
+            model = RunningModel()
             running_models[model_name] = model
             run_server = not opts.network
             server_args = dict(
@@ -356,28 +360,40 @@ class ModelNamespace(flask_socketio.Namespace):
                 Nx=opts.Nx,
                 Ny=opts.Ny,
             )
-            model["server"] = get_server_proxy(**server_args)
+            model.server = get_server_proxy(**server_args)
             if run_server:
-                model["server"].run()
+                model.server.run()
         else:
             model = running_models[model_name]
 
         flask_socketio.join_room(model_name)
-        model["users"] += 1
+        model.users = self.get_users(model_name)
 
-        params = model["server"].server.get(data["params"])
+        params = model.server.server.get(data["params"])
 
         push_thread = PushThread(flask_client=self.flask_client, name=model_name)
 
-        if model["d_thread"] is None:
-            model["d_thread"] = self.flask_client.socketio.start_background_task(
+        if model.d_thread is None:
+            model.d_thread = self.flask_client.socketio.start_background_task(
                 target=push_thread.run,
                 namespace="/modelpage",
-                server=model["server"],
+                server=model.server,
                 room=model_name,
             )
         flask_socketio.emit("update_widgets", params, room=model_name)
 
+        # PushThread only sends the finger positions when they change, so send the
+        # current ones to this user (emit() without a room replies to the sender).
+        server = model.server.server
+        finger_vars = ["finger_x", "finger_y", "finger_Vxy"]
+        if set(finger_vars).issubset(server.get_available_commands()["get"]):
+            res = server.get(finger_vars)
+            finger = {
+                "f_xy": (res["finger_x"], res["finger_y"]),
+                "v_xy": res["finger_Vxy"],
+            }
+            flask_socketio.emit("update_finger", finger)
+
     def on_set_params(self, data):
         """Transfers parameter change to computational server.
 
@@ -395,7 +411,7 @@ class ModelNamespace(flask_socketio.Namespace):
         model_name = data["model_name"]
         model = self.flask_client.running_models[model_name]
         params = {key: float(value) for key, value in data["params"].items()}
-        model["server"].server.set(params)
+        model.server.server.set(params)
         flask_socketio.emit("set_params", params, room=model_name)
 
     def on_click(self, data):
@@ -413,14 +429,13 @@ class ModelNamespace(flask_socketio.Namespace):
         model_name = data["data"]
         model = self.flask_client.running_models[model_name]
         if data["name"] == "reset":
-            params = model["server"].server.reset()
+            params = model.server.server.reset()
             restart = {"name": model_name}
             restart.update({"params": params})
             flask_socketio.leave_room(model_name)
-            model["users"] -= 1
             self.on_start_srv(restart)
         else:
-            model["server"].server.do(data["name"])
+            model.server.server.do(data["name"])
 
     def on_finger(self, data):
         """Transfers new finger potential position to computational server.
@@ -436,7 +451,7 @@ class ModelNamespace(flask_socketio.Namespace):
 
         model_name = data["data"]
         model = self.flask_client.running_models[model_name]
-        server = model["server"].server
+        server = model.server.server
         f_xy = np.asarray(data["f_xy"])
         server.set({"finger_x": f_xy[0], "finger_y": f_xy[1]})
 
@@ -453,24 +468,46 @@ class ModelNamespace(flask_socketio.Namespace):
             dict containing model name
         """
 
-        model_name = data["data"]
+        self.leave_model(data["data"])
+
+    def leave_model(self, model_name):
+        """Leave the model's room, shutting down its server if no users are left.
+
+        Called by :meth:`on_user_exit`, and by :meth:`on_disconnect` for users that
+        disconnect without sending `user_exit`.
+        """
         model = self.flask_client.running_models[model_name]
         flask_socketio.leave_room(model_name)
-        model["users"] -= 1
-        if model["users"] == 0:
-            model["users"] = 0
-            model["server"].quit()
-            model["server"] = None
-            model["d_thread"].join()
-            model["d_thread"] = None
+        model.users = self.get_users(model_name)
+        if model.users == 0 and model.server is not None:
+            model.server.quit()
+            model.server = None
+            model.d_thread.join()
+            model.d_thread = None
+
+    def get_users(self, model_name):
+        """Return the number of users in the model's room.
+
+        This is counted from the room maintained by Socket.IO rather than by hand.
+        """
+        manager = self.flask_client.socketio.server.manager
+        try:
+            return sum(1 for _ in manager.get_participants(self.namespace, model_name))
+        except KeyError:
+            # Socket.IO removes empty rooms.
+            return 0
 
     def on_disconnect(self):
         """Verifies disconnection from websocket.
 
         Automatically called when sockeet communication with Javascript socket.io
-        is terminated or times out.
+        is terminated or times out.  If the user is still in a model's room (i.e.
+        `user_exit` was not sent), then they leave it here.
         """
-
+        running_models = self.flask_client.running_models
+        for room in flask_socketio.rooms():
+            if room in running_models:
+                self.leave_model(room)
         print("Client Disconnected.")
 
     ###############################################################################
@@ -524,9 +561,13 @@ class PushThread(ThreadMixin):
                 self.logger.error(
                     'ERROR: Client asked for tracers, but no server.get_array("tracers")'
                 )
-            return
+                return
 
         max_fps = self.flask_client.opts.fps
+
+        # The finger positions are only sent when they change so the browsers can skip
+        # redrawing the finger canvas.  New users get them from on_start_srv().
+        f_v_xy = None
         while server._running:
             start_time = time.time()
 
@@ -534,10 +575,10 @@ class PushThread(ThreadMixin):
 
             density = server.server.get_array("density")
             rgba = self.flask_client.get_rgba_from_density(density)
-            ### Can we avoid this?
-            rgba = "".join(map(chr, rgba.tobytes()))
 
-            data["rgba"] = rgba
+            # Sent as a binary attachment: no per-byte conversion to a string here, or
+            # UTF-8 encoding on the wire.
+            data["rgba"] = rgba.tobytes()
 
             if has_finger:
                 check_performance = False
@@ -546,10 +587,14 @@ class PushThread(ThreadMixin):
                     data["v_xy"] = list(map(str, np.random.random(2)))  # ("0.5", "0.5")
                 else:
                     res = server.server.get(finger_vars)
-                    data["f_xy"] = (res["finger_x"], res["finger_y"])
-                    data["v_xy"] = res["finger_Vxy"]
+                    f_v_xy_ = ((res["finger_x"], res["finger_y"]), res["finger_Vxy"])
+                    if f_v_xy_ != f_v_xy:
+                        data["f_xy"], data["v_xy"] = f_v_xy = f_v_xy_
             if has_tracers:
-                data["trace"] = server.server.get_array("tracers").tolist()
+                # Binary float32 (2, N) array rather than nested lists.
+                tracers = server.server.get_array("tracers")
+                tracers = np.ascontiguousarray(tracers, dtype=np.float32)
+                data["trace"] = tracers.tobytes()
 
             self.flask_client.socketio.emit(
                 "update", data, namespace=namespace, room=room
@@ -627,8 +672,6 @@ def launch_server(
     if network_server:
         server_ = server.NetworkServer(opts=opts)
     else:
-        print(opts)
-        breakpoint()
         server_ = server.Server(opts=opts)
     server_.run(block=block, interrupted=interrupted)
     return server_
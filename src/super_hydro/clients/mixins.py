@@ -5,22 +5,63 @@ These mixins provide common functionality for various clients.
 
 from matplotlib import cm
 
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
 __all__ = ["ClientDensityMixin"]
 
 
+if numba:
+
+    @numba.njit(parallel=True, cache=True, error_model="numpy")
+    def _get_rgba_numba(density, lut, N):
+        """Numba kernel for `ClientDensityMixin.get_rgba_from_density`.
+
+        Returns the packed pixels `lut[inds]` for the transposed and flipped density,
+        computed in a single pass without temporaries.  `N = len(lut)` must have the
+        same type as `density` so that the binning matches `cm.viridis`.
+        """
+        Nx, Ny = density.shape
+        n_max = density.max()
+        rgba = np.empty((Ny, Nx), dtype=lut.dtype)
+        for iy in numba.prange(Ny):
+            for ix in range(Nx):
+                ind = min(int(density[ix, iy] / n_max * N), len(lut) - 1)
+                rgba[Ny - 1 - iy, ix] = lut[ind]
+        return rgba
+
+
 class ClientDensityMixin:
     """Basic client mixin with functions for manipulating density array."""
 
-    @staticmethod
-    def get_rgba_from_density(density):
+    # Precomputed RGBA lookup table.  Integer inputs index the colormap directly.  Each
+    # uint8 RGBA pixel is packed into a single uint32 so the gather moves one word per
+    # pixel and produces a contiguous buffer.
+    _lut = cm.viridis(np.arange(cm.viridis.N), bytes=True).view(np.uint32).ravel()
+
+    @classmethod
+    def get_rgba_from_density(cls, density):
         """Convert the density array into an rgba array for display.
 
         One must be a bit careful to transpose the arrays so that indexing works
         properly."""
+        lut = cls._lut
+        if numba:
+            rgba = _get_rgba_numba(density, lut, density.dtype.type(len(lut)))
+            return rgba.view(np.uint8).reshape(rgba.shape + (4,))
+
         density = density.T[::-1]
         # array = cm.viridis((n_-n_.min())/(n_.max()-n_.min()))
-        array = cm.viridis(density / density.max())
+        # Same binning as cm.viridis(density / density.max(), bytes=True), but without
+        # the intermediate float64 RGBA array.
+        N = len(lut)
+        inds = np.divide(density, density.max())
+        inds *= N
+        inds = np.minimum(inds, N - 1, out=inds).astype(np.uint8, order="C")
         # array = self._update_frame_with_tracer_particles(array)
-        array *= int(255 / array.max())  # normalize values
-        rgba = array.astype(dtype="uint8")
+        rgba = lut[inds].view(np.uint8).reshape(inds.shape + (4,))
         return rgba
@@ -138,5 +138,11 @@ def get_client_parser():
         type=bool,
         help="Enables communication to separate server process",
     )
+    PARSER.add(
+        "--async_mode",
+        default=None,
+        choices=["threading", "eventlet", "gevent", "gevent_uwsgi"],
+        help="Flask-SocketIO async mode (default: the first one installed)",
+    )
 
     return PARSER
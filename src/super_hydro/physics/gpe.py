@@ -5,10 +5,14 @@ GPE: Gross-Pitaevski Equation
 This modules provides classes for implemented the Gross-Pitaevski
 equation (GPE) for simulating Bose-Einstein condensates (BECs).
 """
+import cmath
+import functools
 import math
+import os
 
 import numpy as np
 import numpy.fft
+import scipy.fft
 
 from .helpers import ModelBase, FingerMixin
 
@@ -21,11 +25,68 @@ try:
 except ImportError:
     mmfutils = None
 
+try:
+    import pyfftw
+except ImportError:
+    pyfftw = None
+
 try:
     import numexpr
 except ImportError:
     numexpr = None
 
+try:
+    import numba
+except ImportError:
+    numba = None
+
+try:
+    import cupy
+    import cupyx.scipy.fft
+except ImportError:
+    cupy = None
+
+
+if numba:
+
+    @numba.njit(parallel=True, fastmath=True, cache=True)
+    def _apply_expV_finger(psi, n, V_trap, Vx, Vy, g, mu, s, f):
+        """Numba kernel for `BEC.apply_expV` with the separable finger potential.
+
+        Updates `psi` in place.  Unlike numexpr, this also supports complex64.
+        """
+        Nx, Ny = psi.shape
+        for ix in numba.prange(Nx):
+            for iy in range(Ny):
+                V = V_trap[ix, iy] + Vx[ix] * Vy[iy] + g * n[ix, iy] - mu
+                psi[ix, iy] *= s * cmath.exp(f * V)
+
+
+@functools.lru_cache(maxsize=None)
+def _set_numexpr_threads():
+    """Use all cores for numexpr (once), unless the user has configured the threads.
+
+    numexpr limits its thread pool to a few cores by default, but the complex exp in
+    apply_expV dominates the non-FFT cost.  numexpr refuses (with an error message)
+    more than MAX_THREADS threads.  This is called when a model first uses numexpr,
+    rather than on import, so that it does not affect other users of numexpr.
+    """
+    _numexpr_vars = {"NUMEXPR_NUM_THREADS", "NUMEXPR_MAX_THREADS", "OMP_NUM_THREADS"}
+    if not _numexpr_vars.intersection(os.environ):
+        numexpr.set_num_threads(
+            min(numexpr.detect_number_of_cores(), numexpr.MAX_THREADS)
+        )
+
+
+if cupy:
+    # GPU version of the apply_expV update, computed in a single kernel launch.
+    _apply_expV_cupy = cupy.ElementwiseKernel(
+        "F V, F n, F g, F mu, F s, C f",
+        "C psi",
+        "psi = s * exp(f * (V + g * n - mu)) * psi",
+        "super_hydro_apply_expV",
+    )
+
 
 _LOGGER = utils.Logger(__name__)
 log = _LOGGER.log
@@ -53,6 +114,17 @@ class GPEBase(ModelBase, FingerMixin):
        Lattice spacing (assumed to be the same in each direction).
     cooling : float
        Amount of cooling to apply to the system during evolution.
+    single_precision : bool
+       If True, then store the state as complex64 rather than complex128.  The
+       evolution is memory bound, so this roughly halves the cost of each step at the
+       expense of precision.  The grids, `K`, the cached `expK` tables and the FFTW
+       plans all follow the state precision, while the total particle number `_N` is
+       kept as a Python float.  (The numexpr kernels only support double precision, so
+       the NumPy versions are used in this case.)
+    use_gpu : bool
+       If True, then keep the state on the GPU and evolve it with CuPy.  Arrays are
+       only transferred to the host by `get_density()`.  Requires CuPy (the `gpu`
+       extra); if it is not installed, we fall back to the CPU.
 
     """
 
@@ -62,6 +134,8 @@ class GPEBase(ModelBase, FingerMixin):
         Ny=32,
         dx=1.0,
         cooling=0.01,
+        single_precision=False,
+        use_gpu=False,
     )
 
     param_docs = dict(
@@ -70,6 +144,8 @@ class GPEBase(ModelBase, FingerMixin):
         Ny="Size of the grid.",
         dx="Lattice spacing (assumed to be the same in each direction).",
         cooling="Amount of cooling to apply to the system during evolution.",
+        single_precision="Use complex64 for the state (halves the memory traffic).",
+        use_gpu="Evolve the state on the GPU with CuPy (if installed).",
     )
 
     layout = w.VBox(
@@ -86,36 +162,94 @@ class GPEBase(ModelBase, FingerMixin):
         Provides an alternative to having to define setters for each
         sensitive parameters.
         """
+        self.dtype = np.complex64 if self.single_precision else np.complex128
+        self.real_dtype = np.finfo(self.dtype).dtype
+
+        if self.use_gpu and cupy is None and not hasattr(self, "xp"):
+            warning("CuPy not installed: using the CPU")
+        # Array module: all arrays live on the GPU if this is cupy.
+        self.xp = cupy if self.use_gpu and cupy else np
+
+        # numexpr does not support complex64 (or the GPU).
+        self._numexpr = (
+            numexpr if self.dtype == np.complex128 and self.xp is np else None
+        )
+        if self._numexpr:
+            _set_numexpr_threads()
+
         Nx, Ny = self.Nxy = self.Nx, self.Ny
-        Lx, Ly = self.Lxy = np.asarray(self.Nxy) * self.dx
-        dx, dy = np.divide(self.Lxy, self.Nxy)
-        x = (np.arange(Nx) * dx - Lx / 2.0)[:, None]
-        y = (np.arange(Ny) * dy - Ly / 2.0)[None, :]
-        self.xy = (x, y)
+        # Keep these as python floats so they do not promote single-precision arrays.
+        Lx, Ly = self.Lxy = (Nx * self.dx, Ny * self.dx)
+        dx, dy = Lx / Nx, Ly / Ny
+
+        # Everything derived from these grids (K, potentials, etc.) inherits real_dtype.
+        x = (np.arange(Nx) * dx - Lx / 2.0)[:, None].astype(self.real_dtype)
+        y = (np.arange(Ny) * dy - Ly / 2.0)[None, :].astype(self.real_dtype)
+        self.xy = (self.xp.asarray(x), self.xp.asarray(y))
 
         self.kxy = kx, ky = (
-            2 * np.pi * np.fft.fftfreq(Nx, dx)[:, None],
-            2 * np.pi * np.fft.fftfreq(Ny, dy)[None, :],
+            self.xp.asarray(
+                (2 * np.pi * np.fft.fftfreq(Nx, dx)[:, None]).astype(self.real_dtype)
+            ),
+            self.xp.asarray(
+                (2 * np.pi * np.fft.fftfreq(Ny, dy)[None, :]).astype(self.real_dtype)
+            ),
         )
 
         cooling_phase = 1 + self.cooling * 1j
         cooling_phase = cooling_phase / abs(cooling_phase)
         self._phase = -1j / self.hbar / cooling_phase
 
-        if mmfutils and False:
+        if self.xp is not np:
+            # cuFFT, with the plans cached by CuPy.
+            self._fft = cupyx.scipy.fft.fftn
+            self._ifft = cupyx.scipy.fft.ifftn
+        elif mmfutils and False:
             self._fft = mmfutils.performance.fft.get_fftn_pyfftw(self.data)
             self._ifft = mmfutils.performance.fft.get_ifftn_pyfftw(self.data)
         else:
-            self._fft = np.fft.fftn
-            self._ifft = np.fft.ifftn
+            # scipy's pocketfft can use multiple threads, unlike numpy.fft.  scipy is a
+            # required dependency, so this is the fallback when pyFFTW is not installed:
+            # pocketfft already transforms the 2D arrays axis by axis in cache-sized
+            # blocks, so there is nothing to gain from a hand-written FFT here.
+            self._fft = functools.partial(scipy.fft.fftn, workers=-1)
+            self._ifft = functools.partial(scipy.fft.ifftn, workers=-1)
 
         super().init()
 
-    def fft(self, y):
-        return self._fft(y, axes=(-1, -2))
+    def get_fftw(self):
+        """Return `(fft, ifft)` pyFFTW plans transforming `self.data`, or `None`.
 
-    def ifft(self, y):
-        return self._ifft(y, axes=(-1, -2))
+        The plans are built with FFTW_MEASURE the first time and cached until
+        `self.data` is replaced.  `fft()` transforms `self.data` into a preallocated
+        buffer which it returns, and `ifft()` transforms that buffer back into
+        `self.data`, so no temporary arrays are allocated.  Returns `None` if pyFFTW
+        is not installed or the state is on the GPU.
+        """
+        if pyfftw is None or self.xp is not np:
+            return None
+        data = self.data
+        if self._fftw is None or self._fftw[0].input_array is not data:
+            with log_task(f"Planning FFTW for {data.shape}"):
+                # FFTW_MEASURE overwrites the arrays while planning.
+                data_ = data.copy()
+                buf = pyfftw.empty_aligned(data.shape, dtype=data.dtype)
+                kw = dict(axes=(-2, -1), flags=("FFTW_MEASURE",), threads=os.cpu_count())
+                fft = pyfftw.FFTW(data, buf, direction="FFTW_FORWARD", **kw)
+                ifft = pyfftw.FFTW(buf, data, direction="FFTW_BACKWARD", **kw)
+                data[...] = data_
+            self._fftw = (fft, ifft)
+        return self._fftw
+
+    def asnumpy(self, a):
+        """Return `a` as a NumPy array on the host."""
+        return cupy.asnumpy(a) if self.xp is not np else a
+
+    def fft(self, y, overwrite_x=False):
+        return self._fft(y, axes=(-1, -2), overwrite_x=overwrite_x)
+
+    def ifft(self, y, overwrite_x=False):
+        return self._ifft(y, axes=(-1, -2), overwrite_x=overwrite_x)
 
     def set(self, param, value):
         """Set the param attribute to value.
@@ -146,7 +280,7 @@ class GPEBase(ModelBase, FingerMixin):
                 tracer_particles.update_tracer_velocity(model=self)
                 tracer_particles.update_tracer_pos(dt, model=self)
 
-            density = self.get_density()
+            density = self._get_density()
             if isinstance(self, FingerMixin) and self.t > 0:
                 # Don't move finger potential while preparing the state.
                 self._step_finger_potential(dt=dt, density=density)
@@ -161,6 +295,13 @@ class GPEBase(ModelBase, FingerMixin):
         # Update tracer particle velocities after each full loop for speed
         # self.update_tracer_velocity()
 
+    # Cached pyFFTW plans.  See get_fftw().
+    _fftw = None
+
+    def _get_density(self):
+        """Return the density without transferring it to the host."""
+        return self.get_density()
+
     ######################################################################
     # Required by subclasses
     dt = NotImplemented
@@ -197,6 +338,9 @@ class BEC(GPEBase):
 
     params_doc = dict(winding="Number of vortices in the initial state.")
 
+    # How often apply_expV() renormalizes the state during real-time evolution.
+    renormalize_steps = 16
+
     layout = w.VBox(
         [w.Checkbox(True, name="cylinder", description="Trap"), GPEBase.layout]
     )
@@ -217,35 +361,48 @@ class BEC(GPEBase):
 
         self.init()
         self.set_initial_data()
-        self._N = self.get_density().sum()
+        self._N = float(self._get_density().sum())
 
     def init(self):
         super().init()
         kx, ky = self.kxy
-        self.K = self.hbar ** 2 * (kx ** 2 + ky ** 2) / 2.0 / self.m
+        self.set_K(
+            self.hbar ** 2 * kx ** 2 / 2.0 / self.m,
+            self.hbar ** 2 * ky ** 2 / 2.0 / self.m,
+        )
         self._V_trap = self.get_V_trap()
         self.dt = self.dt_t_scale * self.t_scale
+        self._expK = {}  # Cache for get_expK()
+        self._norm_steps = 0  # Steps since the last renormalization in apply_expV()
 
     def set_initial_data(self):
-        self.data = np.ones(self.Nxy, dtype=complex) * np.sqrt(self.n0)
-        self._N = self.get_density().sum()
-
-        # Cool a bit to remove transients.
-        _phase, self._phase = self._phase, -1j / self.hbar
-        self.t = -10000
-        self.step(self.cooling_steps, tracer_particles=None)
-        self.t = 0
-        self._phase = _phase
+        self.data = self.xp.full(self.Nxy, np.sqrt(self.n0), dtype=self.dtype)
+        self._N = float(self._get_density().sum())
+
+        # Cool a bit to remove transients.  Without an external potential, the
+        # homogeneous state with n0 = mu/g is already stationary (K annihilates it and
+        # g*n0 - mu = 0) so we can skip the 2*cooling_steps FFTs.
+        if np.any(self.get_Vext()):
+            _phase, self._phase = self._phase, -1j / self.hbar
+            self.t = -10000
+            self.step(self.cooling_steps, tracer_particles=None)
+            self.t = 0
+            self._phase = _phase
 
         if self.cylinder:
             x, y = self.xy
             self.data *= np.exp(1j * self.winding * np.angle(x + 1j * y))
         if self.random_phase:
-            phase = 2 * np.pi * np.random.random(self.Nxy)
+            phase = 2 * np.pi * self.xp.random.random(self.Nxy)
             self.data *= np.exp(1j * phase)
 
     def get_density(self):
+        return self.asnumpy(self._get_density())
+
+    def _get_density(self):
         y = self.data
+        # Benchmarked against y.real**2 + y.imag**2 (NumPy and numexpr): the strided
+        # real/imag views make those no faster than this single complex multiply.
         return (y.conj() * y).real
 
     def get_v(self, y=None):
@@ -285,51 +442,147 @@ class BEC(GPEBase):
         """Return the full external potential."""
         return self._V_trap + super().get_Vext()
 
+    def set_K(self, Kx, Ky):
+        """Set the kinetic energy `K = Kx + Ky` from its separable parts.
+
+        `Kx` and `Ky` depend only on `kx` and `ky` respectively, which allows
+        `get_expK()` to compute the exponentials on the 1D arrays.
+        """
+        Kx, Ky = self._Kxy = (
+            Kx.astype(self.real_dtype, copy=False),
+            Ky.astype(self.real_dtype, copy=False),
+        )
+        self.K = Kx + Ky
+
+    def get_expK(self, dt, factor=1.0):
+        """Return `exp(phase*dt*factor*K)`.
+
+        `step()` only uses a few `(dt, factor)` combinations, so these are cached until
+        `init()` is called again.  Since `K = Kx + Ky`, this is the outer product of
+        `exp(phase*dt*factor*Kx)` and `exp(phase*dt*factor*Ky)`, requiring only `Nx + Ny`
+        exponentials.
+        """
+        key = (self._phase, dt, factor)
+        if key not in self._expK:
+            f = self._phase * dt * factor
+            Kx, Ky = self._Kxy
+            self._expK[key] = np.exp(f * Kx) * np.exp(f * Ky)
+        return self._expK[key]
+
     def apply_expK(self, dt, factor=1.0):
-        y = self.data
-        if numexpr:
-            yt = self.fft(y)
-            self.data[...] = self.ifft(
-                numexpr.evaluate(
-                    "exp(f*K)*y",
-                    local_dict=dict(f=self._phase * dt * factor, K=self.K, y=yt),
-                )
-            )
+        expK = self.get_expK(dt=dt, factor=factor)
+        fftw = self.get_fftw()
+        if fftw:
+            fft, ifft = fftw
+            yt = fft()
+            yt *= expK
+            ifft()
         else:
-            self.data[...] = self.ifft(
-                np.exp(self._phase * dt * self.K * factor) * self.fft(y)
-            )
+            # self.data is overwritten anyway, so let scipy reuse the buffers.  For
+            # complex input, pocketfft then transforms in place, so yt and the result
+            # are views of self.data and the final assignment does not copy.
+            yt = self.fft(self.data, overwrite_x=True)
+            yt *= expK
+            self.data[...] = self.ifft(yt, overwrite_x=True)
 
     def apply_expV(self, dt, factor=1.0, density=None):
         y = self.data
         if density is None:
-            density = self.get_density()
+            density = self._get_density()
         n = density
-        if numexpr:
-            self.data[...] = numexpr.evaluate(
-                "exp(f*(V+g*n-mu))*y*sqrt(_n)",
+
+        # Normalization factor: applied in the same pass as the exponential.  Real-time
+        # evolution (no cooling) is unitary, so the norm only drifts through round-off
+        # and we only need to renormalize every few steps.
+        self._norm_steps += 1
+        if self._phase.real or self._norm_steps >= self.renormalize_steps:
+            s = math.sqrt(self._N / n.sum())
+            self._norm_steps = 0
+        else:
+            s = 1.0
+        fuse = type(self).get_Vext is BEC.get_Vext
+        if self.xp is not np:
+            _apply_expV_cupy(
+                self.get_Vext(),
+                n,
+                self.g,
+                self.mu,
+                s,
+                self._phase * dt * factor,
+                self.data,
+            )
+        elif fuse and numba:
+            Vx, Vy = self.get_Vext_xy()
+            V_trap = np.asarray(self._V_trap, dtype=self.real_dtype)
+            _apply_expV_finger(
+                psi=self.data,
+                n=n,
+                V_trap=np.broadcast_to(V_trap, self.Nxy),
+                Vx=Vx.ravel(),
+                Vy=Vy.ravel(),
+                g=self.g,
+                mu=self.mu,
+                s=s,
+                f=self._phase * dt * factor,
+            )
+        elif fuse and self._numexpr:
+            # Fuse the external potential into the kernel so that none of the
+            # intermediate arrays are materialized.
+            Vext, local_dict = self.get_Vext_numexpr()
+            local_dict.update(
+                V_trap=self._V_trap,
+                g=self.g,
+                n=n,
+                mu=self.mu,
+                s=s,
+                f=self._phase * dt * factor,
+                psi=y,
+            )
+            self._numexpr.evaluate(
+                f"s*exp(f*(V_trap + {Vext} + g*n - mu))*psi",
+                local_dict=local_dict,
+                out=self.data,
+            )
+        elif self._numexpr:
+            self._numexpr.evaluate(
+                "s*exp(f*(V+g*n-mu))*y",
                 local_dict=dict(
                     V=self.get_Vext(),
                     g=self.g,
                     n=n,
                     mu=self.mu,
-                    _n=self._N / n.sum(),
+                    s=s,
                     f=self._phase * dt * factor,
                     y=y,
                 ),
+                out=self.data,
             )
         else:
-            V = self.get_Vext() + self.g * n - self.mu
-            self.data[...] = np.exp(self._phase * dt * V * factor) * y
-            self.data *= np.sqrt(self._N / n.sum())
+            # Work in place on a single real and a single complex buffer.
+            V = np.multiply(n, self.g)
+            V += self.get_Vext()
+            V -= self.mu
+            expV = np.multiply(V, self._phase * dt * factor)
+            expV += math.log(s)
+            self.data *= np.exp(expV, out=expV)
 
     def plot(self):
         from matplotlib import pyplot as plt
 
         n = self.get_density()
-        x, y = self.xy
-        plt.pcolormesh(x.ravel(), y.ravel(), n.T)
-        plt.gca().set_aspect(1)
+        x, y = map(self.asnumpy, self.xy)
+        x, y = x.ravel(), y.ravel()
+        dx, dy = x[1] - x[0], y[1] - y[0]
+
+        # The grid is uniform, so imshow is equivalent to (and much faster than)
+        # pcolormesh.  The extent is that of the cells centered on the grid points.
+        extent = (x[0] - dx / 2, x[-1] + dx / 2, y[0] - dy / 2, y[-1] + dy / 2)
+        plt.imshow(
+            n.T.astype(np.float32),
+            extent=extent,
+            origin="lower",
+            interpolation="nearest",
+        )
         plt.plot([self.pot_z.real], [self.pot_z.imag], "ro")
         plt.plot([self.z_finger.real], [self.z_finger.imag], "go")
         plt.title("{:.2f}".format(self.t))
@@ -360,7 +613,8 @@ class BECVortices(BEC):
     def init(self):
         self.Omega = 0
         super().init()
-        A = 0.8 ** 2 * np.prod(self.Lxy)
+        Lx, Ly = self.Lxy
+        A = 0.8 ** 2 * Lx * Ly
         self.Omega = self.N_vortex * self.hbar * np.pi / self.m / A
 
     def get_V_trap(self):
@@ -404,7 +658,10 @@ class BECFlow(BEC):
     def init(self):
         super().init()
         kx, ky = self.kxy
-        self.K = self.hbar ** 2 * (kx ** 2 + kx * self.kv + ky ** 2) / 2.0 / self.m
+        self.set_K(
+            self.hbar ** 2 * (kx ** 2 + kx * self.kv) / 2.0 / self.m,
+            self.hbar ** 2 * ky ** 2 / 2.0 / self.m,
+        )
 
     @property
     def kv(self):
@@ -427,7 +684,10 @@ class BECVortexRing(BECFlow):
     def init(self):
         super().init()
         kx, ky = self.kxy
-        self.K = self.hbar ** 2 * (kx ** 2 + kx * self.kv + ky ** 2) / 2.0 / self.m
+        self.set_K(
+            self.hbar ** 2 * (kx ** 2 + kx * self.kv) / 2.0 / self.m,
+            self.hbar ** 2 * ky ** 2 / 2.0 / self.m,
+        )
 
     @property
     def kv(self):
@@ -476,7 +736,7 @@ class BECSoliton(BECFlow):
             self.set_initial_data()
 
     def set_initial_data(self):
-        self.data = np.empty(self.Nxy, dtype=complex)
+        self.data = self.xp.empty(self.Nxy, dtype=self.dtype)
 
         x, y = self.xy
         v_c = self.v_c
@@ -522,23 +782,33 @@ class BECQuantumFriction(BEC):
     def get_Kc(self):
         raise NotImplementedError()
 
-    def apply_H(self, psi):
-        """compute dy/dt=H psi"""
+    def apply_H(self, psi, Vext=None):
+        """compute dy/dt=H psi
+
+        Parameters
+        ----------
+        Vext : array, None
+           External potential `super().get_Vext()` if already computed.
+        """
+        if Vext is None:
+            Vext = super().get_Vext()
         psi_k = self.fft(psi)
         n = (psi.conj() * psi).real
-        V = super().get_Vext() + self.g * n - self.mu
+        V = Vext + self.g * n - self.mu
         Hpsi = self.ifft(self.K * psi_k) + V * psi
-        Hpsi = Hpsi / np.sqrt(self._N)
+        Hpsi = Hpsi / math.sqrt(self._N)
         return Hpsi
 
-    def get_Vc(self):
+    def get_Vc(self, Vext=None):
         """implement the Vc local cooling potential"""
         psi = self.data
-        Hpsi = self.apply_H(psi)
+        Hpsi = self.apply_H(psi, Vext=Vext)
         return self.Vc_cooling * 2 * (psi.conj() * Hpsi).imag
 
     def get_Vext(self):
-        return super().get_Vext() + self.get_Vc()
+        # Compute the (trap + finger) potential once and share it with get_Vc().
+        Vext = super().get_Vext()
+        return Vext + self.get_Vc(Vext=Vext)
 
 
 @implementer(interfaces.IModel)
@@ -581,7 +851,7 @@ class BECBreather(BEC):
             self.set_initial_data()
 
     def set_initial_data(self):
-        self.data = np.empty(self.Nxy, dtype=complex)
+        self.data = self.xp.empty(self.Nxy, dtype=self.dtype)
         x, y = self.xy
         Lx, Ly = self.Lxy
         z = x + 1j * y
@@ -623,8 +893,8 @@ class PersistentCurrents(BEC):
         """
         V = self.get_V_trap()
         n0 = np.where(V < self.mu, (self.mu - V) / self.g, 0)
-        self.data = np.ones(self.Nxy, dtype=complex) * np.sqrt(n0)
-        self._N = self.get_density().sum()
+        self.data = self.xp.ones(self.Nxy, dtype=self.dtype) * np.sqrt(n0)
+        self._N = float(self._get_density().sum())
 
         # Cool a bit to remove transients.
         _phase, self._phase = self._phase, -1 / self.hbar
@@ -637,7 +907,7 @@ class PersistentCurrents(BEC):
         self.data *= np.exp(1j * self.winding * np.angle(x + 1j * y))
 
         if self.random_phase:
-            phase = 2 * np.pi * np.random.random(self.Nxy)
+            phase = 2 * np.pi * self.xp.random.random(self.Nxy)
             self.data *= np.exp(1j * phase)
 
     def get_V_trap(self):
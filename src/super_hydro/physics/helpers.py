@@ -7,6 +7,7 @@ Some tools to make writing models easier.
 import argparse
 import collections.abc
 import inspect
+import math
 
 import numpy as np
 
@@ -41,9 +42,8 @@ class ModelBase:
             opts = argparse.Namespace(**opts)
 
         # Update any of the parameters from opts if provided.
-        params = {_k: _v for _k, _v, _doc in self.get_params_and_docs()}
         self.params = {
-            _key: getattr(opts, _key, params[_key])
+            _key: getattr(opts, _key, _val)
             for _key, _val, _doc in self.get_params_and_docs()
         }
 
@@ -159,6 +159,15 @@ class FingerMixin:
 
     def get_Vext(self):
         """Return the full external potential."""
+        Vx, Vy = self.get_Vext_xy()
+        return Vx * Vy
+
+    def get_Vext_xy(self):
+        """Return `(Vx, Vy)` such that `get_Vext() == Vx * Vy`.
+
+        The Gaussian finger potential is separable, so only `Nx + Ny` exponentials
+        are needed rather than `Nx * Ny`.
+        """
         x, y = self.xy
         z0 = self.pot_z
         x0, y0 = z0.real, z0.imag
@@ -167,9 +176,18 @@ class FingerMixin:
         # Wrap displaced x and y in periodic box.
         x = (x - x0 + Lx / 2) % Lx - Lx / 2
         y = (y - y0 + Ly / 2) % Ly - Ly / 2
-        r2 = x ** 2 + y ** 2
         V0 = self.finger_V0_mu * self.mu
-        return V0 * np.exp(-r2 / 2.0 / self.finger_r0 ** 2)
+        a = -1 / 2.0 / self.finger_r0 ** 2
+        return V0 * np.exp(a * x ** 2), np.exp(a * y ** 2)
+
+    def get_Vext_numexpr(self):
+        """Return `(expr, local_dict)` for computing `get_Vext()` with numexpr.
+
+        This allows models to fuse the potential into their own numexpr kernels
+        rather than materializing it.
+        """
+        Vx, Vy = self.get_Vext_xy()
+        return "Vx*Vy", dict(Vx=Vx, Vy=Vy)
 
     def get_finger_v_max(self, density):
         """Return the maximum speed finger potential will move at."""
@@ -182,17 +200,18 @@ class FingerMixin:
         pot_a += -self.finger_damp * self.pot_v
         self.pot_v += dt * pot_a
         v_max = self.get_finger_v_max(density=density)
-        if abs(self.pot_v) > v_max:
-            self.pot_v *= v_max / abs(self.pot_v)
+        pot_v = self.pot_v
+        v2 = pot_v.real ** 2 + pot_v.imag ** 2
+        if v2 > v_max ** 2:
+            self.pot_v = pot_v * (v_max / math.sqrt(v2))
         self.pot_z = self.mod(pot_z)
 
     def mod(self, z):
         """Make sure the point z lies in the box."""
+        # Called every step, so avoid building intermediate sequences.
+        Lx, Ly = self.Lxy
         return complex(
-            *[
-                (_x + _L / 2) % (_L) - _L / 2
-                for _x, _L in zip((z.real, z.imag), self.Lxy)
-            ]
+            (z.real + Lx / 2) % Lx - Lx / 2, (z.imag + Ly / 2) % Ly - Ly / 2
         )
 
     ######################################################################
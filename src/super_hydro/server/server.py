@@ -1,6 +1,6 @@
 __doc__ = """SuperHydro Server."""
 
-from collections import deque
+from collections import defaultdict, deque
 from contextlib import contextmanager
 import datetime
 import functools
@@ -91,7 +91,6 @@ class ThreadMixin:
             self._heartbeat_tic = time.time()
 
     def _count(self, name):
-        self._counters.setdefault(name, 0)
         self._counters[name] += 1
 
     @property
@@ -122,7 +121,7 @@ class ThreadMixin:
         shutdown_min : int, None
            Time after which to shutdown the server.  Default is 1 hour.
         """
-        self._counters = {}
+        self._counters = defaultdict(int)
         self.shutdown = False
         self.shutdown_time = time.time() + shutdown_min * 60
         self.name = name
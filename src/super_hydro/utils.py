@@ -57,8 +57,9 @@ def mstep(t, t1, alpha=3.0):
     r"""Smooth step function that goes from 0 at time ``t=0`` to 1 at time
     ``t=t1``.  This step function is $C_\infty$:
     """
+    # Use t <= 0 (not t < 0): in single precision tan(-pi/2) is large and positive.
     return np.where(
-        t < 0.0,
+        t <= 0.0,
         0.0,
         np.where(
             t < t1, (1 + np.tanh(alpha * np.tan(np.pi * (2 * t / t1 - 1) / 2))) / 2, 1.0
@@ -52,13 +52,11 @@ function FlaskClient(name, document_) {
   let height = densityCanvas.canvas.height;
 
   if (data.hasOwnProperty("f_xy")) {
-   model.f_xy = data["f_xy"];
-   model.v_xy = data["v_xy"];
-   fingerCanvas.draw(model);
+   updateFinger(data);
   }
   
   if (data.hasOwnProperty("trace")) {
-   tracerCanvas.draw(data.trace, model.nx, model.ny, width, height);
+   tracerCanvas.draw(new Float32Array(data.trace), model.nx, model.ny, width, height);
   }
   
   // FPS Counter tracking:
@@ -73,6 +71,14 @@ function FlaskClient(name, document_) {
   document.getElementById('ping-pong').innerHTML = model.fps;
   _timeStart = _timeEnd;  
  };
+
+ function updateFinger(data) {
+  // Update the finger positions.  Sent with each update when they change, and
+  // when this user joins.
+  model.f_xy = data["f_xy"];
+  model.v_xy = data["v_xy"];
+  fingerCanvas.draw(model);
+ }
  
  // Resize all of the widgets.
  function resize() {
@@ -195,6 +201,7 @@ function FlaskClient(name, document_) {
  socket.on('set_params', setParams);
  socket.on('connect', onConnect);
  socket.on('update_widgets', updateWidgets);
+ socket.on('update_finger', updateFinger);
  
  // Event listener for User mouse-click interaction/placement of potential
  // finger on Canvas display element.
@@ -236,7 +243,8 @@ function DensityCanvas(canvas, model, document_) {
  };
 
  function draw(rgba) {
-  let rgba_ = Uint8ClampedArray.from(rgba, c => c.charCodeAt(0))
+  // rgba is the binary ArrayBuffer sent by the client, so this is just a view.
+  let rgba_ = new Uint8ClampedArray(rgba);
   let nx = model.nx;
   let ny = model.ny;
   let image_data = new ImageData(rgba_, nx, ny);
@@ -335,10 +343,12 @@ function TracerCanvas(canvas, model, document_) {
 
 	ctx.clearRect(0,0,width,height);
 
+	// trace is the flattened (2, N) array of positions.
+	var n = trace.length / 2;
 	var i;
-	for (i=0; i < trace[0].length; i++) {
+	for (i=0; i < n; i++) {
 	 ctx.beginPath();
-	 ctx.arc(trace[1][i] / nx * width, trace[0][i] / ny * height, 2, 0, 2*Math.PI);
+	 ctx.arc(trace[n + i] / nx * width, trace[i] / ny * height, 2, 0, 2*Math.PI);
 	 ctx.stroke();
 	}
  }
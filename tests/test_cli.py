@@ -1,3 +1,9 @@
+import ast
+import importlib
+import subprocess
+import sys
+import textwrap
+
 import pytest
 import click.testing
 
@@ -16,3 +22,158 @@ class TestCLI:
         """Test setting options in various ways."""
         res = runner.invoke(super_hydro.cli.super_hydro, ["--test-cli"])
         ctx = super_hydro.cli._testing["ctx"]
+
+    def test_option_types(self, runner):
+        """Config-file values are converted, and CLI values are used directly."""
+        with open("super_hydro.conf", "w") as f:
+            f.write("[gpe.BEC]\nNx = 48\ncylinder = no\nfinger_Vxy = (0.1, 0.2)\n")
+        res = runner.invoke(
+            super_hydro.cli.super_hydro, ["--test-cli", "gpe.BEC", "--Ny", "12"]
+        )
+        assert res.exit_code == 0
+        options = ast.literal_eval(res.output.splitlines()[-1])["gpe.BEC"]
+        assert options["Nx"] == 48
+        assert options["Ny"] == 12
+        assert options["cylinder"] is False
+        assert options["finger_Vxy"] == (0.1, 0.2)
+
+    def test_config_types(self, runner):
+        """Config-file values reach the model options with the parameter's type."""
+        with open("super_hydro.conf", "w") as f:
+            f.write("[gpe.BEC]\nNx = 48.0\nwinding = 1e2\ncooling = 0\n")
+        res = runner.invoke(super_hydro.cli.super_hydro, ["--test-cli"])
+        assert res.exit_code == 0
+        options = ast.literal_eval(res.output.splitlines()[-1])["gpe.BEC"]
+        assert options["Nx"] == 48 and type(options["Nx"]) is int
+        assert options["winding"] == 100 and type(options["winding"]) is int
+        assert options["cooling"] == 0 and type(options["cooling"]) is float
+
+    def test_config_invalid(self, runner):
+        """Invalid config-file values report the model and parameter."""
+        with open("super_hydro.conf", "w") as f:
+            f.write("[gpe.BEC]\nNx = 48.5\n")
+        res = runner.invoke(super_hydro.cli.super_hydro, ["--test-cli"])
+        assert isinstance(res.exception, ValueError)
+        assert "'48.5'" in str(res.exception)
+        assert "'Nx'" in str(res.exception)
+        assert "gpe.BEC" in str(res.exception)
+
+    def test_config_changed(self, runner):
+        """Changes to the config files are picked up."""
+        for Nx in [48, 128]:
+            with open("super_hydro.conf", "w") as f:
+                f.write(f"[gpe.BEC]\nNx = {Nx}\n")
+            res = runner.invoke(super_hydro.cli.super_hydro, ["--test-cli"])
+            assert res.exit_code == 0
+            options = ast.literal_eval(res.output.splitlines()[-1])["gpe.BEC"]
+            assert options["Nx"] == Nx
+        assert super_hydro.cli.read_config_files.cache_info().currsize == 1
+
+    def test_config_models(self, runner, monkeypatch):
+        """Models can be added from the config file."""
+        with open("mymodels.py", "w") as f:
+            f.write("from super_hydro.physics.gpe import BEC\n")
+        monkeypatch.syspath_prepend(".")
+        monkeypatch.delitem(sys.modules, "mymodels", raising=False)
+        with open("super_hydro.conf", "w") as f:
+            f.write("[super_hydro]\nmodels = 'mymodels'\n")
+        res = runner.invoke(super_hydro.cli.super_hydro, ["--test-cli"])
+        assert res.exit_code == 0
+        assert "mymodels.BEC" in ast.literal_eval(res.output.splitlines()[-1])
+
+
+def test_parse_config_value():
+    parse = super_hydro.cli.parse_config_value
+    assert parse("3", default=1) == 3
+    assert parse("3", default=1.0) == 3.0
+    assert parse("3.0", default=1) == 3
+    assert type(parse("3.0", default=1)) is int
+    assert parse("on", default=False) is True
+    assert parse("(1, 2)", default=(0, 0)) == (1, 2)
+    assert parse("100%", default="") == "100%"
+    with pytest.raises(ValueError):
+        parse("maybe", default=False)
+    with pytest.raises(ValueError):
+        parse("3.5", default=1)
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "['mymodels', 'other.models']",
+        "('mymodels', 'other.models')",
+        "mymodels, other.models",
+        "mymodels\n    other.models",
+    ],
+)
+def test_parse_models(value):
+    assert super_hydro.cli.parse_models(value) == ["mymodels", "other.models"]
+
+
+def test_parse_models_single():
+    parse = super_hydro.cli.parse_models
+    assert parse("'mymodels'") == ["mymodels"]
+    assert parse("mymodels") == ["mymodels"]
+    assert parse("") == []
+    for value in ["1", "{'mymodels': 1}", "['mymodels', 1]"]:
+        with pytest.raises(ValueError):
+            parse(value)
+
+
+def load_models(models):
+    """Return `models` with all ModelRef instances loaded."""
+    return {
+        name: Model.load() if isinstance(Model, super_hydro.cli.ModelRef) else Model
+        for name, Model in models.items()
+    }
+
+
+@pytest.mark.parametrize("module_name", super_hydro.cli.get_physics_modules())
+def test_find_models_physics(module_name):
+    """Parsing the physics modules must find the same models as importing them."""
+    Params = super_hydro.cli.SuperHydroParams
+    models = Params.find_models(module_name)
+    assert load_models(models) == Params.get_models(
+        importlib.import_module(module_name)
+    )
+
+
+def test_find_models_lazy():
+    """Finding the physics models must not import them (or NumPy)."""
+    code = textwrap.dedent(
+        """
+        import sys
+        import super_hydro.cli as cli
+
+        for module_name in cli.get_physics_modules():
+            models = cli._find_physics_models(module_name)
+            assert all(isinstance(_m, cli.ModelRef) for _m in models.values())
+            assert module_name not in sys.modules, module_name
+        assert "super_hydro.physics.gpe.BEC" in {
+            f"{_m.module}.{_m.name}"
+            for _m in cli._find_physics_models("super_hydro.physics.gpe").values()
+        }
+        assert "numpy" not in sys.modules
+        """
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_find_models_external(tmp_path, monkeypatch):
+    """External modules can import and subclass models."""
+    (tmp_path / "mymodels.py").write_text(
+        textwrap.dedent(
+            """
+            from super_hydro.physics.gpe import BEC
+
+            class MyBEC(BEC):
+                \"\"\"My BEC.\"\"\"
+            """
+        )
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, "mymodels", raising=False)
+    Params = super_hydro.cli.SuperHydroParams
+    models = Params.find_models("mymodels")
+    assert set(models) == {"mymodels.BEC", "mymodels.MyBEC"}
+    assert load_models(models) == Params.get_models(importlib.import_module("mymodels"))
@@ -0,0 +1,34 @@
+from matplotlib import cm
+import numpy as np
+import pytest
+
+from super_hydro.clients import mixins
+
+
+@pytest.fixture(params=["numba", "numpy"])
+def get_rgba(request, monkeypatch):
+    """Return `get_rgba_from_density` using either the numba or the NumPy path."""
+    if request.param == "numba":
+        if mixins.numba is None:
+            pytest.skip("numba not installed")
+    else:
+        monkeypatch.setattr(mixins, "numba", None)
+    return mixins.ClientDensityMixin.get_rgba_from_density
+
+
+@pytest.mark.parametrize("dtype", [np.float32, np.float64])
+@pytest.mark.parametrize("shape", [(32, 32), (48, 31), (17, 64)])
+def test_get_rgba_from_density(get_rgba, dtype, shape):
+    """The RGBA array must match the matplotlib colormap exactly."""
+    rng = np.random.default_rng(seed=2)
+    # Values on the bin edges check that the rounding also agrees.
+    edges = 0.3 * (np.arange(np.prod(shape)) % 257)
+    densities = [edges.reshape(shape)] + [rng.random(shape) for _n in range(10)]
+    for density in densities:
+        density = density.astype(dtype)
+        rgba = get_rgba(density)
+        assert rgba.dtype == np.uint8
+        assert rgba.flags.c_contiguous
+        assert rgba.shape == shape[::-1] + (4,)
+        expected = cm.viridis(density.T[::-1] / density.max(), bytes=True)
+        assert np.array_equal(rgba, expected)
@@ -1,6 +1,7 @@
-# import numpy as np
-# import pytest
+import numpy as np
+import pytest
 
+from super_hydro.physics import gpe
 
 # from super_hydro.physics.gpe import State
 
@@ -12,3 +13,85 @@ def test_gpe():
 #    s = State(Nxy=(32, 64))
 #    assert s.data.shape == (32, 64)
 #    # assert np.allclose(s.data, np.sqrt(s.n0))
+
+
+@pytest.mark.parametrize(
+    "Model", [gpe.BEC, gpe.BECFlow, gpe.BECVortices, gpe.BECQuantumFriction]
+)
+def test_single_precision(Model):
+    """Single-precision evolution should agree with double precision."""
+    densities = []
+    for single_precision in [True, False]:
+        model = Model(dict(Nx=32, Ny=32, single_precision=single_precision))
+        model.set("finger_x", 0.6)
+        model.step(5)
+        assert model.data.dtype == (np.complex64 if single_precision else complex)
+        assert model.get_Vext().dtype == model.real_dtype
+        densities.append(model.get_density())
+    n32, n64 = densities
+    assert abs(n32 - n64).max() < 1e-4 * abs(n64).max()
+
+
+@pytest.mark.parametrize("cooling", [0.0, 0.01])
+def test_renormalize_steps(cooling):
+    """Skipping the renormalization must not change the evolution."""
+    models = []
+    for renormalize_steps in [gpe.BEC.renormalize_steps, 1]:
+        model = gpe.BEC(dict(Nx=32, Ny=32, cooling=cooling))
+        model.renormalize_steps = renormalize_steps
+        model.set("finger_x", 0.6)
+        N0 = model.get_density().sum()
+        model.step(2 * gpe.BEC.renormalize_steps + 3)
+        models.append(model)
+
+    if cooling:
+        # Imaginary-time evolution is not unitary: renormalize every step.
+        assert model._phase.real != 0
+        assert np.array_equal(models[0].data, models[1].data)
+    else:
+        # Real-time evolution conserves the particle number up to round-off.
+        assert np.allclose(models[0].get_density().sum(), N0, rtol=1e-12, atol=0)
+        assert np.allclose(models[0].data, models[1].data, rtol=1e-12, atol=1e-12)
+
+
+def test_numexpr_threads(monkeypatch):
+    """The numexpr threads are only set by models using numexpr."""
+    numexpr = pytest.importorskip("numexpr")
+    calls = []
+    monkeypatch.setattr(numexpr, "set_num_threads", calls.append)
+    for var in ["NUMEXPR_NUM_THREADS", "NUMEXPR_MAX_THREADS", "OMP_NUM_THREADS"]:
+        monkeypatch.delenv(var, raising=False)
+    gpe._set_numexpr_threads.cache_clear()
+
+    gpe.BEC(dict(Nx=32, Ny=32, single_precision=True))
+    assert calls == []
+    gpe.BEC(dict(Nx=32, Ny=32))
+    gpe.BEC(dict(Nx=32, Ny=32))
+    assert calls == [min(numexpr.detect_number_of_cores(), numexpr.MAX_THREADS)]
+
+    # Respect the user's configuration.
+    monkeypatch.setenv("NUMEXPR_NUM_THREADS", "2")
+    gpe._set_numexpr_threads.cache_clear()
+    gpe.BEC(dict(Nx=32, Ny=32))
+    assert len(calls) == 1
+
+
+@pytest.mark.parametrize("single_precision", [True, False])
+@pytest.mark.parametrize("Model", [gpe.BEC, gpe.BECQuantumFriction])
+def test_gpu(Model, single_precision):
+    """Evolution on the GPU should agree with the CPU."""
+    cupy = pytest.importorskip("cupy")
+    densities = []
+    for use_gpu in [True, False]:
+        model = Model(
+            dict(Nx=32, Ny=32, use_gpu=use_gpu, single_precision=single_precision)
+        )
+        assert model.xp is (cupy if use_gpu else np)
+        model.set("finger_x", 0.6)
+        model.step(5)
+        assert model.data.dtype == (np.complex64 if single_precision else complex)
+        densities.append(model.get_density())
+    n_gpu, n_cpu = densities
+    assert isinstance(n_gpu, np.ndarray)
+    rtol = 1e-4 if single_precision else 1e-10
+    assert abs(n_gpu - n_cpu).max() < rtol * abs(n_cpu).max()